@@ -1,6 +1,17 @@
+import io
+import threading
+
 import streamlit as st
 import numpy as np
+import matplotlib
+matplotlib.use("Agg")  # headless renderer; avoids GUI backend discovery on start-up
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
+import pandas as pd
+import altair as alt
+
+import losses
 
 # Page configuration
 st.set_page_config(page_title="MOSFET Ciss Analysis with Slope", layout="wide")
@@ -14,7 +25,7 @@ st.sidebar.header("1. System Parameters")
 V_in = st.sidebar.number_input("Input Voltage Vin (V)", value=24.0, step=1.0)
 V_out = st.sidebar.number_input("Output Voltage Vout (V)", value=12.0, step=0.5)
 V_drive = st.sidebar.number_input("Gate Drive Voltage Vdrive (V)", value=10.0, step=0.5)
-I_driver = st.sidebar.number_input("Driver Current Capability (A)", value=1.0, step=0.1)
+I_driver = st.sidebar.number_input("Driver Current Capability (A)", min_value=0.01, value=1.0, step=0.1)
 
 st.sidebar.header("2. Fixed Conditions")
 I_out = st.sidebar.number_input("Fixed Load Current I_out (A)", value=10.0, step=1.0)
@@ -28,96 +39,193 @@ ciss_start_pF = st.sidebar.slider("Ciss Start (pF)", 500, 2000, 500)
 ciss_end_pF = st.sidebar.slider("Ciss End (pF)", 2000, 10000, 5000)
 
 # Frequency Settings
+@st.cache_data(max_entries=256)
+def parse_floats(s):
+    """Parse a comma-separated list of numbers into a (hashable) tuple of floats."""
+    return tuple(float(x.strip()) for x in s.split(','))
+
 freq_input = st.sidebar.text_input("Comparison Frequencies (kHz)", "100, 200, 300")
 try:
-    freq_list_khz = [float(x.strip()) for x in freq_input.split(',')]
+    freq_tuple = parse_floats(freq_input)
 except:
     st.sidebar.error("Format error. Please enter numbers separated by commas.")
-    freq_list_khz = [100, 200, 300]
+    freq_tuple = (100, 200, 300)
+
+st.sidebar.header("4. Display")
+renderer = st.sidebar.radio("Chart Renderer", ["Interactive (Vega-Lite)", "Matplotlib (static)"],
+                            help="Interactive charts are rendered in the browser and support zoom, pan and tooltips.")
 
 # ==========================================
 # 2. Calculation Logic
 # ==========================================
 
-ciss_range_pF = np.linspace(ciss_start_pF, ciss_end_pF, 100)
-ciss_range_F = ciss_range_pF * 1e-12
-D = V_out / V_in 
-
-# Prepare Plots
-fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 10))
-
-for f_khz in freq_list_khz:
-    f_hz = f_khz * 1000
-    
-    P_total_list = []
-    T_j_list = []
-    
-    # Conduction Loss (Fixed because Rdson and Load are fixed)
-    P_cond = D * (I_out ** 2) * Rdson
-    
-    for Ciss in ciss_range_F:
-        # Switching Loss Estimation
-        t_sw_estimated = (Ciss * V_drive) / I_driver 
-        P_sw = 0.5 * V_in * I_out * t_sw_estimated * f_hz
-        
-        # Gate Drive Loss
-        P_gate = (Ciss * V_drive) * V_drive * f_hz
-        
-        P_total = P_cond + P_sw + P_gate
-        P_total_list.append(P_total)
-        
-        T_j = Tamb + (P_total * Rtha)
-        T_j_list.append(T_j)
-
-    # --- Plotting & Labeling ---
-    
-    # 1. Plot lines
-    line, = ax1.plot(ciss_range_pF, P_total_list, label=f'{f_khz} kHz')
-    ax2.plot(ciss_range_pF, T_j_list, label=f'{f_khz} kHz')
-    
-    # 2. Calculate Slope
-    # Slope = (Y_end - Y_start) / (X_end - X_start)
-    # Convert unit to "per nF" (1 nF = 1000 pF)
-    delta_P = P_total_list[-1] - P_total_list[0]
-    delta_T = T_j_list[-1] - T_j_list[0]
-    delta_C_pF = ciss_range_pF[-1] - ciss_range_pF[0]
-    
-    slope_P = (delta_P / delta_C_pF) * 1000 # Unit: W/nF
-    slope_T = (delta_T / delta_C_pF) * 1000 # Unit: °C/nF
-    
-    # 3. Add Slope Text at the end of the line
-    ax1.text(ciss_range_pF[-1] + 50, P_total_list[-1], 
-             f'm={slope_P:.2f} W/nF', 
-             color=line.get_color(), fontsize=10, fontweight='bold', va='center')
-             
-    ax2.text(ciss_range_pF[-1] + 50, T_j_list[-1], 
-             f'm={slope_T:.1f} °C/nF', 
-             color=line.get_color(), fontsize=10, fontweight='bold', va='center')
-
-# --- Chart Styling ---
-
-# Extend X-axis to make room for text labels
-x_padding = (ciss_end_pF - ciss_start_pF) * 0.25 
-ax1.set_xlim(ciss_start_pF, ciss_end_pF + x_padding)
-ax2.set_xlim(ciss_start_pF, ciss_end_pF + x_padding)
-
-# Graph 1: Power
-ax1.set_title(f'Total Power Loss (Slope in W/nF) @ Load={I_out}A')
-ax1.set_ylabel('Power Loss (W)')
-ax1.set_xlabel('Input Capacitance Ciss (pF)')
-ax1.grid(True, which='both', linestyle='--', alpha=0.6)
-ax1.legend(loc='upper left')
-
-# Graph 2: Temperature
-ax2.set_title(f'Junction Temperature (Slope in °C/nF) @ Load={I_out}A')
-ax2.set_ylabel('Temperature (°C)')
-ax2.set_xlabel('Input Capacitance Ciss (pF)')
-ax2.grid(True, which='both', linestyle='--', alpha=0.6)
-ax2.axhline(y=150, color='r', linestyle='--', label='Max Tj (150°C)')
-ax2.legend(loc='upper left')
-
-plt.tight_layout()
-st.pyplot(fig)
+@st.cache_data(max_entries=256, ttl="1h")
+def compute_curves(V_in, V_out, V_drive, I_driver, I_out, Rdson, Rtha, Tamb,
+                   ciss_start_pF, ciss_end_pF, freq_tuple):
+    """Evaluate the loss model over the Ciss x frequency grid; cached per parameter set."""
+    # Every loss term is affine in Ciss, so the two end points describe each
+    # curve exactly; intermediate samples would only add plot data.
+    ciss_range_pF = np.linspace(ciss_start_pF, ciss_end_pF, 2)
+    ciss_range_F = ciss_range_pF * 1e-12
+
+    # Evaluate every (Ciss, frequency) pair at once: rows = Ciss, columns = frequency
+    f_hz = np.array(freq_tuple, dtype=float) * 1000.0
+    _, _, _, P_total, T_j = losses.compute(V_in, V_out, V_drive, I_driver, I_out, Rdson, Rtha, Tamb,
+                                           ciss_range_F[:, None], f_hz[None, :])
+
+    # Analytic slope, converted to "per nF" (1 nF = 1e-9 F)
+    dP_dC, dT_dC = losses.ciss_slope(V_in, V_drive, I_driver, I_out, Rtha, f_hz)
+    dP_dC_per_nF = dP_dC * 1e-9 # Unit: W/nF
+    dT_dC_per_nF = dT_dC * 1e-9 # Unit: °C/nF
+
+    return ciss_range_pF, P_total, T_j, dP_dC_per_nF, dT_dC_per_nF
+
+
+@st.cache_resource
+def get_fig():
+    """Create the Matplotlib figure once per process and reuse it across reruns."""
+    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 10), constrained_layout=True)
+    return fig, ax1, ax2, threading.Lock()
+
+
+@st.cache_data(max_entries=64, ttl="1h")
+def build_figure(V_in, V_out, V_drive, I_driver, I_out, Rdson, Rtha, Tamb,
+                 ciss_start_pF, ciss_end_pF, freq_tuple):
+    """Draw the loss curves and return the figure as PNG bytes; cached per parameter set."""
+    ciss_range_pF, P_total, T_j, slope_P, slope_T = compute_curves(
+        V_in, V_out, V_drive, I_driver, I_out, Rdson, Rtha, Tamb,
+        ciss_start_pF, ciss_end_pF, freq_tuple)
+
+    # Reuse the process-wide figure; the lock keeps concurrent sessions from
+    # drawing into it at the same time.
+    fig, ax1, ax2, lock = get_fig()
+    with lock:
+        ax1.clear()
+        ax2.clear()
+
+        # --- Plotting & Labeling ---
+
+        # 1. Plot lines: one LineCollection per axis instead of one Line2D per frequency
+        labels = [f'{f_khz} kHz' for f_khz in freq_tuple]
+        cycle_colors = plt.rcParams['axes.prop_cycle'].by_key()['color']
+        colors = [cycle_colors[j % len(cycle_colors)] for j in range(len(labels))]
+        power_segs = [np.column_stack([ciss_range_pF, P_total[:, j]]) for j in range(len(labels))]
+        temp_segs = [np.column_stack([ciss_range_pF, T_j[:, j]]) for j in range(len(labels))]
+        ax1.add_collection(LineCollection(power_segs, colors=colors))
+        ax2.add_collection(LineCollection(temp_segs, colors=colors))
+        ax1.autoscale_view()
+        ax2.autoscale_view()
+        legend_handles = [Line2D([], [], color=c, label=l) for c, l in zip(colors, labels)]
+
+        for j, color in enumerate(colors):
+            # 2. Add Slope Text at the end of the line
+            ax1.text(ciss_range_pF[-1] + 50, P_total[-1, j], 
+                     f'm={slope_P[j]:.2f} W/nF', 
+                     color=color, fontsize=10, fontweight='bold', va='center')
+                 
+            ax2.text(ciss_range_pF[-1] + 50, T_j[-1, j], 
+                     f'm={slope_T[j]:.1f} °C/nF', 
+                     color=color, fontsize=10, fontweight='bold', va='center')
+
+        # --- Chart Styling ---
+
+        # Extend X-axis to make room for text labels
+        x_padding = (ciss_end_pF - ciss_start_pF) * 0.25 
+        ax1.set_xlim(ciss_start_pF, ciss_end_pF + x_padding)
+        ax2.set_xlim(ciss_start_pF, ciss_end_pF + x_padding)
+
+        # Graph 1: Power
+        ax1.set_title(f'Total Power Loss (Slope in W/nF) @ Load={I_out}A')
+        ax1.set_ylabel('Power Loss (W)')
+        ax1.set_xlabel('Input Capacitance Ciss (pF)')
+        ax1.grid(True, which='both', linestyle='--', alpha=0.6)
+        ax1.legend(handles=legend_handles, loc='upper left')
+
+        # Graph 2: Temperature
+        ax2.set_title(f'Junction Temperature (Slope in °C/nF) @ Load={I_out}A')
+        ax2.set_ylabel('Temperature (°C)')
+        ax2.set_xlabel('Input Capacitance Ciss (pF)')
+        ax2.grid(True, which='both', linestyle='--', alpha=0.6)
+        tj_max = ax2.axhline(y=150, color='r', linestyle='--', label='Max Tj (150°C)')
+        ax2.legend(handles=legend_handles + [tj_max], loc='upper left')
+
+        buf = io.BytesIO()
+        # 80 dpi keeps the PNG small; st.image stretches it to the container width
+        fig.savefig(buf, format='png', dpi=80, bbox_inches='tight')
+    return buf.getvalue()
+
+
+def build_altair_charts(V_in, V_out, V_drive, I_driver, I_out, Rdson, Rtha, Tamb,
+                        ciss_start_pF, ciss_end_pF, freq_tuple):
+    """Build client-side (Vega-Lite) power and temperature charts with slope labels."""
+    ciss_range_pF, P_total, T_j, slope_P, slope_T = compute_curves(
+        V_in, V_out, V_drive, I_driver, I_out, Rdson, Rtha, Tamb,
+        ciss_start_pF, ciss_end_pF, freq_tuple)
+
+    labels = [f'{f_khz} kHz' for f_khz in freq_tuple]
+    n_ciss = len(ciss_range_pF)
+
+    # Long format: one row per (Ciss, frequency) sample
+    df = pd.DataFrame({
+        'Ciss (pF)': np.repeat(ciss_range_pF, len(labels)),
+        'Frequency': np.tile(labels, n_ciss),
+        'Power Loss (W)': P_total.ravel(),
+        'Temperature (°C)': T_j.ravel(),
+    })
+    # Slope labels sit at the end of each line
+    df_end = pd.DataFrame({
+        'Ciss (pF)': ciss_range_pF[-1],
+        'Frequency': labels,
+        'Power Loss (W)': P_total[-1],
+        'Temperature (°C)': T_j[-1],
+        'slope_P': [f'm={m:.2f} W/nF' for m in slope_P],
+        'slope_T': [f'm={m:.1f} °C/nF' for m in slope_T],
+    })
+
+    x = alt.X('Ciss (pF):Q', title='Input Capacitance Ciss (pF)',
+              scale=alt.Scale(domain=[ciss_start_pF, ciss_end_pF + (ciss_end_pF - ciss_start_pF) * 0.25]))
+    color = alt.Color('Frequency:N', sort=labels)
+    # Autoscale y like Matplotlib instead of Vega-Lite's default zero baseline
+    y_power = alt.Y('Power Loss (W):Q', scale=alt.Scale(zero=False))
+    y_temp = alt.Y('Temperature (°C):Q', scale=alt.Scale(zero=False))
+
+    power = alt.Chart(df).mark_line(point=True).encode(
+        x=x, y=y_power, color=color,
+        tooltip=['Frequency:N', alt.Tooltip('Ciss (pF):Q', format='.0f'),
+                 alt.Tooltip('Power Loss (W):Q', format='.2f')]).interactive()
+    power_text = alt.Chart(df_end).mark_text(align='left', dx=5, fontWeight='bold').encode(
+        x=x, y=y_power, text='slope_P:N', color=color)
+    power_chart = (power + power_text).properties(
+        title=f'Total Power Loss (Slope in W/nF) @ Load={I_out}A')
+
+    temp = alt.Chart(df).mark_line(point=True).encode(
+        x=x, y=y_temp, color=color,
+        tooltip=['Frequency:N', alt.Tooltip('Ciss (pF):Q', format='.0f'),
+                 alt.Tooltip('Temperature (°C):Q', format='.1f')]).interactive()
+    temp_text = alt.Chart(df_end).mark_text(align='left', dx=5, fontWeight='bold').encode(
+        x=x, y=y_temp, text='slope_T:N', color=color)
+    # Max Tj guide line, encoded on the temperature field so the y-axis title stays clean
+    df_tj_max = pd.DataFrame({'Ciss (pF)': [ciss_start_pF], 'Temperature (°C)': [150],
+                              'label': ['Max Tj (150°C)']})
+    tj_max = alt.Chart(df_tj_max).mark_rule(
+        color='red', strokeDash=[6, 4]).encode(y=y_temp)
+    tj_max_text = alt.Chart(df_tj_max).mark_text(align='left', dx=5, dy=-8, color='red').encode(
+        x=x, y=y_temp, text='label:N')
+    temp_chart = (temp + temp_text + tj_max + tj_max_text).properties(
+        title=f'Junction Temperature (Slope in °C/nF) @ Load={I_out}A')
+
+    return power_chart, temp_chart
+
+
+params = (V_in, V_out, V_drive, I_driver, I_out, Rdson, Rtha, Tamb,
+          ciss_start_pF, ciss_end_pF, freq_tuple)
+
+if renderer == "Interactive (Vega-Lite)":
+    power_chart, temp_chart = build_altair_charts(*params)
+    st.altair_chart(power_chart, width="stretch")
+    st.altair_chart(temp_chart, width="stretch")
+else:
+    st.image(build_figure(*params), width="stretch")
 
 # Explanation Box
 st.success("""
@@ -0,0 +1,42 @@
+"""Buck converter MOSFET loss model shared by the Streamlit UI."""
+
+
+def _ciss_coefficients(V_in, V_drive, I_driver, I_out, f):
+    """Per-farad switching and gate-drive loss coefficients (W/F) at frequency f."""
+    # Switching Loss Estimation (t_sw = Ciss * Vdrive / Idriver)
+    k_sw = 0.5 * V_in * I_out * V_drive / I_driver * f
+    # Gate Drive Loss
+    k_gate = V_drive * V_drive * f
+    return k_sw, k_gate
+
+
+def compute(V_in, V_out, V_drive, I_driver, I_out, Rdson, Rtha, Tamb, Ciss, f):
+    """Return (P_cond, P_sw, P_gate, P_total, T_j) for the given operating point.
+
+    Every argument may be a scalar or a NumPy array; the results follow
+    NumPy broadcasting, e.g. ``Ciss[:, None]`` against ``f[None, :]`` gives
+    one row per Ciss value and one column per switching frequency.
+    Units: V, A, Ohm, °C/W, °C, F, Hz.
+    """
+    D = V_out / V_in
+
+    # Conduction Loss
+    P_cond = D * (I_out ** 2) * Rdson
+
+    # The frequency-dependent factors are computed once per frequency
+    # rather than once per (Ciss, frequency) grid point.
+    k_sw, k_gate = _ciss_coefficients(V_in, V_drive, I_driver, I_out, f)
+    P_sw = k_sw * Ciss
+    P_gate = k_gate * Ciss
+
+    P_total = P_cond + P_sw + P_gate
+    T_j = Tamb + (P_total * Rtha)
+
+    return P_cond, P_sw, P_gate, P_total, T_j
+
+
+def ciss_slope(V_in, V_drive, I_driver, I_out, Rtha, f):
+    """Return the analytic sensitivities (dP_total/dCiss in W/F, dT_j/dCiss in °C/F)."""
+    k_sw, k_gate = _ciss_coefficients(V_in, V_drive, I_driver, I_out, f)
+    dP_dC = k_sw + k_gate
+    return dP_dC, dP_dC * Rtha